@@ -1,18 +1,11 @@
 import streamlit as st
-import pandas as pd
+from scripts.app_data import get_df
 
 st.set_page_config(page_title="Tech Layoffs Dashboard", layout="wide")
 st.title("📊 Tech Layoffs Analysis Dashboard")
 
 # --- Load Data ---
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/Cleaned_layoffs.csv")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df["year"] = df["date"].dt.year
-    return df
-
-df = load_data()
+df = get_df()
 
 # --- KPI Cards ---
 total_layoffs = int(df["total_laid_off"].sum())
@@ -5,62 +5,96 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 from io import BytesIO
+from scripts.app_data import get_df, sorted_options
 
 st.set_page_config(page_title="Company Profiles", layout="wide")
 st.title("🏢 Company Layoff Profiles")
 
 @st.cache_data
-def load_data():
-    df = pd.read_csv("data/Cleaned_layoffs.csv")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df["quarter"] = df["date"].dt.to_period("Q").astype(str)
-    df["year"] = df["date"].dt.year
-    return df
+def load_company_year_totals():
+    # Pre-aggregated (year, industry, company) -> total_laid_off, written by scripts/data_loader.py
+    return pd.read_parquet("data/agg_company_year.parquet", memory_map=True)
 
-df_full = load_data()
+@st.cache_data
+def industry_share_totals(industry, years):
+    # company -> total_laid_off inside one industry (+years), largest first; keyed on a
+    # hashable years tuple. Companies with no layoffs in scope are left out (zero-area slices).
+    agg = load_company_year_totals()
+    agg = agg[agg["industry"] == industry]
+    if years:
+        agg = agg[agg["year"].isin(years)]
+    totals = agg.groupby("company")["total_laid_off"].sum()
+    return totals[totals > 0].sort_values(ascending=False).reset_index()
+
+@st.cache_data
+def filter_options(years):
+    # Sidebar option lists (industries, companies per industry) for a year selection,
+    # read from the small pre-aggregated table
+    agg = load_company_year_totals()
+    if years:
+        agg = agg[agg["year"].isin(years)]
+    industries = sorted_options(agg["industry"])
+    companies_by_industry = {
+        industry: sorted_options(group["company"])
+        for industry, group in agg.groupby("industry", observed=True, sort=False)
+    }
+    return industries, companies_by_industry
+
+@st.cache_data
+def company_quarter_ts(company, industry, years):
+    # Quarterly totals for one company (any industry) or for all companies of an industry.
+    # resample yields a sorted, gap-free quarter index (empty quarters = 0) in one pass.
+    df = get_df()
+    if company == "All Companies":
+        df = df[df["industry"] == industry]
+    else:
+        df = df[df["company"] == company]
+    if years:
+        df = df[df["year"].isin(years)]
+    ts = (
+        df.dropna(subset=["date"])
+        .set_index("date")["total_laid_off"]
+        .resample("QE").sum()
+    )
+    if years:
+        ts = ts[ts.index.year.isin(years)]
+    ts.index = ts.index.to_period("Q").astype(str)
+    return ts.rename_axis("quarter").reset_index()
+
+df_full = get_df()
 
 # ---------------- Sidebar (match Trends behavior) ----------------
 with st.sidebar:
     st.header("Filters")
 
     # Year(s) selection
-    years_avail = sorted(df_full["year"].dropna().unique().tolist())
+    years_avail = sorted_options(load_company_year_totals()["year"])
     selected_years = st.multiselect(
         "Select Year(s)",
         options=years_avail,
         default=None
     )
+    years_key = tuple(sorted(selected_years))
 
-    # Apply year filter first
-    df_base = df_full.copy()
-    if selected_years:
-        df_base = df_base[df_base["year"].isin(selected_years)]
-
-    # Industry selection
-    industries = sorted(df_base["industry"].dropna().unique())
+    # Industry selection (within the selected years)
+    industries, companies_by_industry = filter_options(years_key)
     selected_industry = st.selectbox("Select Industry", industries)
 
-    # Apply industry filter
-    df_base = df_base[df_base["industry"] == selected_industry]
-
     # Company selection (filtered by both)
-    companies = sorted(df_base["company"].dropna().unique())
+    companies = companies_by_industry.get(selected_industry, [])
     company_options = ["All Companies"] + companies
     selected_company = st.selectbox("Select a Company", company_options, index=0)
 
     smooth_toggle = st.checkbox("Smooth timelines (2-quarter rolling mean)", value=True)
 
-# Build the slice for THIS company or all companies
+# Build the slice for THIS company or all companies (one mask, no intermediate copies)
 if selected_company == "All Companies":
-    df_company_all = df_full[df_full["industry"] == selected_industry].copy()
-    if selected_years:
-        df_company_all = df_company_all[df_company_all["year"].isin(selected_years)]
-    df_company = df_company_all.copy()
+    scope_mask = df_full["industry"].to_numpy() == selected_industry
 else:
-    df_company_all = df_full[df_full["company"] == selected_company].copy()
-    df_company = df_company_all.copy()
-    if selected_years:
-        df_company = df_company[df_company["year"].isin(selected_years)]
+    scope_mask = df_full["company"].to_numpy() == selected_company
+if selected_years:
+    scope_mask &= df_full["year"].isin(selected_years).to_numpy()
+df_company = df_full[scope_mask]
 
 years_label = "All years" if not selected_years else ", ".join(map(str, selected_years))
 scope_label = f"**{selected_company}**" if selected_company != "All Companies" else "**All Companies**"
@@ -75,12 +109,13 @@ st.markdown("---")
 
 # ---------------- KPI Header ----------------
 total_laid_off = int(df_company["total_laid_off"].sum())
-rounds = int(df_company["date"].nunique())
-peak_q = (
-    df_company.groupby("quarter")["total_laid_off"]
-    .sum().reset_index()
-    .sort_values("total_laid_off", ascending=False).head(1)
-)
+# Distinct event dates = layoff rounds (sort-based np.unique, reused for rounds per year)
+round_dates = np.unique(df_company["date"].dropna().to_numpy())
+rounds = int(round_dates.size)
+
+# Quarterly totals, shared by the KPI header and the timeline / cumulative charts
+ts = company_quarter_ts(selected_company, selected_industry, years_key)
+peak_q = ts.loc[[ts["total_laid_off"].idxmax()]] if not ts.empty else ts
 peak_q_label = peak_q["quarter"].iloc[0] if not peak_q.empty else "—"
 peak_q_val = int(peak_q["total_laid_off"].iloc[0]) if not peak_q.empty else 0
 
@@ -94,10 +129,6 @@ st.markdown("---")
 
 #1> Quarterly Layoff Timeline ----------------
 st.subheader(f"1. Layoff Timeline — {selected_company}")
-ts = (
-    df_company.groupby("quarter")["total_laid_off"]
-    .sum().reset_index().sort_values("quarter")
-)
 if smooth_toggle:
     ts["y"] = ts["total_laid_off"].rolling(2, min_periods=1).mean()
     ylab = "Total Laid Off (Smoothed)"
@@ -118,31 +149,7 @@ st.subheader("2. Layoff Share Within Industry")
 
 # Base share: sum layoffs by company inside the selected industry (+years)
 highlight_company = selected_company if selected_company != "All Companies" else None
-companies_in_industry = (
-    df_full[df_full["industry"] == selected_industry]["company"].dropna().unique()
-)
-
-industry_share = (
-    df_base
-    .groupby('company')['total_laid_off']
-    .sum()
-    .reset_index()
-)
-
-# Ensure all companies in this industry appear (even if 0 layoffs in the scope)
-missing_zero = set(companies_in_industry) - set(industry_share['company'])
-if missing_zero:
-    industry_share = pd.concat(
-        [industry_share, pd.DataFrame({'company': list(missing_zero), 'total_laid_off': 0})],
-        ignore_index=True
-    )
-
-# Keep highlight company present (even if filtered to zero)
-if highlight_company and highlight_company not in industry_share['company'].values:
-    industry_share = pd.concat(
-        [industry_share, pd.DataFrame({'company': [highlight_company], 'total_laid_off': [0]})],
-        ignore_index=True
-    )
+industry_share = industry_share_totals(selected_industry, years_key)
 
 total_scope = industry_share['total_laid_off'].sum()
 
@@ -161,44 +168,30 @@ if total_scope == 0:
         showlegend=True
     )
 else:
-    # Calculate share and group small slices into "Others"
-    industry_share = industry_share.sort_values('total_laid_off', ascending=False)
+    # Calculate share and hover label per company (already sorted largest first)
     industry_share['share'] = industry_share['total_laid_off'] / total_scope
-    main_companies = industry_share[industry_share['share'] >= 0.008].copy()
-    others = industry_share[industry_share['share'] < 0.008].copy()
-    if not others.empty:
-        others_label = "Others"
-        others_total = others['total_laid_off'].sum()
-        # Combine hover text for all "Others"
-        others_hover = "<br>".join([
-            f"{row['company']}: {row['total_laid_off']:,} layoffs ({row['share']*100:.2f}%)"
-            for _, row in others.iterrows()
-        ])
-        main_companies = pd.concat([
-            main_companies,
-            pd.DataFrame({
-                'company': [others_label],
-                'total_laid_off': [others_total],
-                'share': [others_total / total_scope],
-                'hover': [others_hover]
-            })
-        ], ignore_index=True)
-        hover_texts = main_companies.apply(
-            lambda row: row['hover'] if row['company'] == others_label else
-            f"{row['company']}: {row['total_laid_off']:,} layoffs ({row['share']*100:.2f}%)",
-            axis=1
-        )
-    else:
-        main_companies['hover'] = main_companies.apply(
-            lambda row: f"{row['company']}: {row['total_laid_off']:,} layoffs ({row['share']*100:.2f}%)",
-            axis=1
+    industry_share['hover'] = (
+        industry_share['company'].astype(str) + ": "
+        + industry_share['total_laid_off'].map('{:,}'.format) + " layoffs ("
+        + (industry_share['share'] * 100).map('{:.2f}'.format) + "%)"
+    )
+    # Small slices share one "Others" bucket (its hover lists every member)
+    industry_share['bucket'] = np.where(
+        industry_share['share'] < 0.008, "Others", industry_share['company']
+    )
+    main_companies = (
+        industry_share.groupby('bucket', sort=False)
+        .agg(
+            total_laid_off=('total_laid_off', 'sum'),
+            share=('share', 'sum'),
+            hover=('hover', "<br>".join)
         )
-        hover_texts = main_companies['hover']
+        .rename_axis('company')
+        .reset_index()
+    )
+    hover_texts = main_companies['hover']
 
-    pull_vals = [
-        0.06 if c == highlight_company else 0
-        for c in main_companies['company']
-    ]
+    pull_vals = np.where(main_companies['company'].to_numpy() == highlight_company, 0.06, 0.0)
 
     fig_pie = px.pie(
         main_companies,
@@ -230,8 +223,7 @@ st.markdown("---")
 
 #3> Cumulative Layoffs (selected years) ----------------
 st.subheader("3. Cumulative Layoffs (Selected Years)")
-ts_cum = ts.copy()
-ts_cum["cumulative"] = ts_cum["total_laid_off"].cumsum()
+ts_cum = ts.assign(cumulative=ts["total_laid_off"].cumsum())
 fig_cum = px.area(ts_cum, x="quarter", y="cumulative")
 fig_cum.update_layout(
     xaxis_title="Quarter",
@@ -254,12 +246,10 @@ else:
 
 #5> Layoff Rounds per Year ----------------
 st.subheader("5. Layoff Rounds per Year")
-rounds_year = (
-    df_company.dropna(subset=["date"])
-    .groupby("year")["date"].nunique()
-    .reset_index(name="layoff_rounds")
-    .sort_values("year")
+round_years, round_counts = np.unique(
+    round_dates.astype("datetime64[Y]").astype(int) + 1970, return_counts=True
 )
+rounds_year = pd.DataFrame({"year": round_years, "layoff_rounds": round_counts})
 fig_rounds = px.bar(rounds_year, x="year", y="layoff_rounds")
 fig_rounds.update_layout(
     xaxis_title="Year",
@@ -272,8 +262,8 @@ st.plotly_chart(fig_rounds, use_container_width=True)
 st.subheader("6. Top Locations by Total Layoffs")
 if "location" in df_company.columns and df_company["location"].notna().any():
     top_loc = (
-        df_company.groupby("location")["total_laid_off"]
-        .sum().sort_values(ascending=False).head(10).reset_index()
+        df_company.groupby("location", observed=True)["total_laid_off"]
+        .sum().nlargest(10).reset_index()
     )
     fig_loc = px.bar(top_loc, x="total_laid_off", y="location", orientation="h")
     fig_loc.update_layout(
@@ -296,6 +286,7 @@ display_cols = [
 table_df = df_company[display_cols].sort_values("date")
 st.dataframe(table_df, use_container_width=True)
 
+@st.cache_data
 def df_to_csv_bytes(d: pd.DataFrame) -> bytes:
     return d.to_csv(index=False).encode("utf-8")
 
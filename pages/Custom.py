@@ -1,9 +1,14 @@
 # pages/customs.py — Custom Derived Metrics (Plotly version, notebook formulas preserved)
 
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
+from scripts.app_data import category_mask, full_options, rows_for_years, sorted_options
+from scripts.metrics import (
+    calculate_layoff_efficiency,
+    calculate_layoff_instability,
+    calculate_layoff_severity,
+)
 
 st.set_page_config(page_title="Custom Metrics", layout="wide")
 st.title("🧮 Custom Derived Metrics")
@@ -18,67 +23,65 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/Cleaned_layoffs.csv")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df["quarter"] = df["date"].dt.to_period("Q").astype(str)
-    df["year"] = df["date"].dt.year
-    return df
+def scope_rows(years, industries=(), countries=(), companies=()):
+    # Rows of the shared frame inside the sidebar filters (empty filter = no restriction);
+    # the sidebar cascade and the cached metrics both scope through here
+    df = rows_for_years(years)
+    mask = np.ones(len(df), dtype=bool)
+    if industries:
+        mask &= category_mask(df["industry"], industries)
+    if countries:
+        mask &= category_mask(df["country"], countries)
+    if companies:
+        mask &= category_mask(df["company"], companies)
+    return df if mask.all() else df[mask]
 
-df_full = load_data()
+@st.cache_data
+def scope_metrics(years, industries, countries, companies):
+    # Efficiency / instability / severity for one filter selection, cached per selection
+    # (tuples as cache keys)
+    df = scope_rows(years, industries, countries, companies)
+    return (
+        calculate_layoff_efficiency(df),
+        calculate_layoff_instability(df),
+        calculate_layoff_severity(df),
+    )
 
 # ---------------- Sidebar (align with Trends/Company) ----------------
 with st.sidebar:
     st.header("Filters")
 
     # Years (default=None => acts as "All years" until user picks)
-    years_all = sorted(df_full["year"].dropna().unique().tolist())
+    years_all = full_options()["year"]
     sel_years = st.multiselect("Select Year(s)", options=years_all, default=None)
 
-    # Base slice by years
-    base = df_full.copy()
-    if sel_years:
-        base = base[base["year"].isin(sel_years)]
-
-    # Optional Industry filter
-    industries_all = sorted(base["industry"].dropna().unique().tolist())
+    # Optional Industry filter (options within the selected years)
+    industries_all = sorted_options(scope_rows(sel_years)["industry"])
     sel_industries = st.multiselect("Industry", options=industries_all, default=None)
-    if sel_industries:
-        base = base[base["industry"].isin(sel_industries)]
 
     # Optional Country filter
-    countries_all = sorted(base["country"].dropna().unique().tolist())
+    countries_all = sorted_options(scope_rows(sel_years, sel_industries)["country"])
     sel_countries = st.multiselect("Country", options=countries_all, default=None)
-    if sel_countries:
-        base = base[base["country"].isin(sel_countries)]
 
-    # Company multiselect — default to ALL in current scope
-    # Build options after applying Year/Industry/Country filters
-    companies_all = sorted(base["company"].dropna().unique().tolist())
+    # Company multiselect — options follow the Year/Industry/Country filters above
+    companies_all = sorted_options(scope_rows(sel_years, sel_industries, sel_countries)["company"])
+
+    # Drop remembered picks that are no longer in scope, so the keyed widget stays valid
+    if "companies_sel" in st.session_state:
+        st.session_state.companies_sel = [
+            c for c in st.session_state.companies_sel if c in companies_all
+        ]
 
-# Leave default empty -> visually clean; logically means "all companies"
+    # Leave default empty -> visually clean; logically means "all companies"
     selected_companies = st.multiselect(
         "Companies (optional)",
         options=companies_all,
-        default=None,                      # <-- empty by default
+        default=None,
+        key="companies_sel",
         help="Leave empty to include all companies in the selected scope."
     )
 
-# After you compute companies_all (new scope)
-if "companies_sel" in st.session_state:
-    st.session_state.companies_sel = [
-        c for c in st.session_state.companies_sel if c in companies_all
-    ]
-
-selected_companies = st.multiselect(
-    "Companies (optional)",
-    options=companies_all,
-    default=None,
-    key="companies_sel",
-    help="Leave empty to include all companies in the selected scope."
-)
-df = base if not selected_companies else base[base["company"].isin(selected_companies)]
+df = scope_rows(sel_years, sel_industries, sel_countries, selected_companies)
 
 
 # Scope label
@@ -92,6 +95,10 @@ if df.empty:
     st.info("No data in the current selection. Try broadening your filters.")
     st.stop()
 
+inefficient, instability, lsi_by_company = scope_metrics(
+    tuple(sel_years), tuple(sel_industries), tuple(sel_countries), tuple(selected_companies)
+)
+
 #1> Layoff Efficiency (Notebook formula, Plotly)
 st.subheader("1. Layoff Efficiency")
 st.markdown(
@@ -107,47 +114,21 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-req_cols_eff = {"total_laid_off", "percentage_laid_off", "funds_raised_clean", "company"}
-if not req_cols_eff.issubset(df.columns):
-    st.warning("Efficiency inputs missing. Required columns: total_laid_off, percentage_laid_off, funds_raised_clean, company.")
+if inefficient.empty:
+    st.info("No rows available for efficiency metric after filtering.")
 else:
-    eff = df[
-        df["total_laid_off"].notna()
-        & df["percentage_laid_off"].notna()
-        & df["funds_raised_clean"].notna()
-        & (df["percentage_laid_off"] > 0)
-        & (df["funds_raised_clean"] > 0)
-    ].copy()
-
-    if eff.empty:
-        st.info("No rows available for efficiency metric after filtering.")
-    else:
-        eff["layoffs_per_million"] = eff["total_laid_off"] / (eff["funds_raised_clean"] / 1_000_000)
-        eff["layoff_efficiency_score"] = eff["layoffs_per_million"] / eff["percentage_laid_off"]
-
-        inefficient = (
-            eff.groupby("company")
-            .agg({
-                "total_laid_off": "sum",
-                "percentage_laid_off": "mean",
-                "funds_raised_clean": "sum",
-                "layoffs_per_million": "mean",
-                "layoff_efficiency_score": "mean",
-            })
-            .reset_index()
-        )
-        top_eff = inefficient.sort_values("layoff_efficiency_score", ascending=False).head(15)
-
-        fig_eff = px.bar(
-            top_eff,
-            x="layoff_efficiency_score",
-            y="company",
-            orientation="h",
-            title="Top Companies by Layoff Inefficiency Score",
-            template="plotly_white",
-        )
-        fig_eff.update_layout(xaxis_title="Layoff Efficiency Score (Layoffs per $1M ÷ % staff cut)", yaxis_title="Company")
-        st.plotly_chart(fig_eff, use_container_width=True)
+    top_eff = inefficient.head(15)
+
+    fig_eff = px.bar(
+        top_eff,
+        x="layoff_efficiency_score",
+        y="company",
+        orientation="h",
+        title="Top Companies by Layoff Inefficiency Score",
+        template="plotly_white",
+    )
+    fig_eff.update_layout(xaxis_title="Layoff Efficiency Score (Layoffs per $1M ÷ % staff cut)", yaxis_title="Company")
+    st.plotly_chart(fig_eff, use_container_width=True)
 
 st.markdown("---")
 
@@ -164,17 +145,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-inst = df.copy()
-inst["quarter"] = pd.to_datetime(inst["date"], errors="coerce").dt.to_period("Q")
-instability = (
-    inst.dropna(subset=["company", "quarter"])[["company", "quarter"]]
-    .drop_duplicates()
-    .groupby("company")
-    .size()
-    .reset_index(name="layoff_instability_score")
-    .sort_values("layoff_instability_score", ascending=False)
-)
-
 if instability.empty:
     st.info("No rows available for instability metric after filtering.")
 else:
@@ -206,30 +176,18 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-req_cols_sev = {"percentage_laid_off", "total_laid_off", "company"}
-if not req_cols_sev.issubset(df.columns):
-    st.warning("Severity inputs missing. Required columns: percentage_laid_off, total_laid_off, company.")
+if lsi_by_company.empty:
+    st.info("No rows available for severity metric after filtering.")
 else:
-    sev = df[(df["percentage_laid_off"].notnull()) & (df["total_laid_off"].notnull())].copy()
-    if sev.empty:
-        st.info("No rows available for severity metric after filtering.")
-    else:
-        sev["layoff_severity_index"] = sev["percentage_laid_off"] * np.log(sev["total_laid_off"] + 1)
-        lsi_by_company = (
-            sev.groupby("company")["layoff_severity_index"]
-            .mean()
-            .reset_index()
-            .sort_values("layoff_severity_index", ascending=False)
-        )
-        top_sev = lsi_by_company.head(15)
-
-        fig_sev = px.bar(
-            top_sev,
-            x="layoff_severity_index",
-            y="company",
-            orientation="h",
-            title="Top 15 Companies by Layoff Severity Index (LSI)",
-            template="plotly_white",
-        )
-        fig_sev.update_layout(xaxis_title="Average LSI", yaxis_title="Company")
-        st.plotly_chart(fig_sev, use_container_width=True)
+    top_sev = lsi_by_company.head(15)
+
+    fig_sev = px.bar(
+        top_sev,
+        x="layoff_severity_index",
+        y="company",
+        orientation="h",
+        title="Top 15 Companies by Layoff Severity Index (LSI)",
+        template="plotly_white",
+    )
+    fig_sev.update_layout(xaxis_title="Average LSI", yaxis_title="Company")
+    st.plotly_chart(fig_sev, use_container_width=True)
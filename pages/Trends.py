@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+from scripts.app_data import category_mask, full_options, get_df, year_positions
 
 st.set_page_config(page_title="Layoff Trends", layout="wide")
 st.title("📊 Tech Layoff Trends")
@@ -10,29 +11,236 @@ def pct_change_safe(curr, prev):
         return np.nan
     return (curr - prev) / prev * 100.0
 
-def add_outlier_annotations(fig, quarterly_df, top_n=3):
-    # Annotate top N quarters by total_laid_off (within current filters)
-    q = quarterly_df.sort_values("total_laid_off", ascending=False).head(top_n)
-    for _, r in q.iterrows():
-        fig.add_scatter(
-            x=[r["quarter"]], y=[r["total_laid_off"]],
-            mode="markers+text",
-            text=[f"⬆ {int(r['total_laid_off']):,}"],
-            textposition="top center",
-            marker=dict(size=10, color="#EF553B", line=dict(color="black", width=1)),
-            showlegend=False
+def add_outlier_annotations(fig, quarterly_df, top_n=3, value_col="total_laid_off", fmt="{:,.0f}"):
+    # Annotate top N quarters by value_col (within current filters) as one marker trace
+    q = quarterly_df.nlargest(top_n, value_col)
+    if q.empty:
+        return fig
+    vals = q[value_col].to_numpy()
+    fig.add_scatter(
+        x=q["quarter"].tolist(), y=vals.tolist(),
+        mode="markers+text",
+        text=["⬆ " + fmt.format(v) for v in vals],
+        textposition="top center",
+        marker=dict(size=10, color="#EF553B", line=dict(color="black", width=1)),
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data
+def scope_positions(years, countries, industries):
+    # Row positions of the shared frame inside the sidebar filters, computed once per selection
+    # and shared by every cached helper below: the precomputed per-year row positions, kept
+    # where the combined country / industry code mask holds
+    df = get_df()
+    positions = year_positions(years)
+    mask = np.ones(len(df), dtype=bool)
+    if countries:
+        mask &= category_mask(df['country'], countries)
+    if industries:
+        mask &= category_mask(df['industry'], industries)
+    return positions[mask[positions]]
+
+def filter_scope(years, countries, industries):
+    # Rows of the shared frame inside the sidebar filters, in file order
+    return get_df().take(scope_positions(years, countries, industries))
+
+@st.cache_resource
+def totals_cube():
+    # (quarter, year, industry, country, size) -> total_laid_off over the whole dataset, built
+    # once per process and shared read-only like get_df(); far fewer rows than layoff events
+    dims = ['quarter', 'year', 'industry', 'country', 'company_size_category']
+    return (
+        get_df().groupby(dims, observed=True, sort=False, dropna=False)['total_laid_off']
+        .sum()
+        .reset_index()
+    )
+
+@st.cache_data
+def scope_aggregates(years, countries, industries):
+    # KPI / section 1-4 aggregates for one filter selection, cached on the (hashable) filter
+    # tuples so reruns from unrelated widgets don't rescan the filtered frame.
+    # Every filter is a cube dimension, so the per-dimension totals are rolled up from the
+    # matching cube rows; only the distinct-company counts need the event rows.
+    df = filter_scope(years, countries, industries)
+    cube = totals_cube()
+    mask = np.ones(len(cube), dtype=bool)
+    if years:
+        mask &= cube['year'].isin(years).to_numpy()
+    if countries:
+        mask &= category_mask(cube['country'], countries)
+    if industries:
+        mask &= category_mask(cube['industry'], industries)
+    fused = cube[mask]
+    # Both quarter Series share one sorted quarter index, so they combine without a join
+    by_quarter = fused.groupby('quarter', observed=True)['total_laid_off'].sum()
+    # Active companies per quarter from the category codes: distinct (quarter, company) code
+    # pairs via np.unique, counted per quarter code with np.bincount
+    quarter_codes = df['quarter'].cat.codes.to_numpy().astype(np.int64)
+    company_codes = df['company'].cat.codes.to_numpy()
+    n_companies = len(df['company'].cat.categories)
+    has_both = (quarter_codes >= 0) & (company_codes >= 0)
+    pairs = np.unique(quarter_codes[has_both] * n_companies + company_codes[has_both])
+    active_per_code = np.bincount(pairs // n_companies, minlength=len(df['quarter'].cat.categories))
+    active = pd.Series(active_per_code[by_quarter.index.codes], index=by_quarter.index)
+    by_year = fused.groupby('year', sort=False)['total_laid_off'].sum()
+
+    return {
+        'quarterly': by_quarter.reset_index(),
+        'quarterly_norm': pd.DataFrame({
+            'total_laid_off': by_quarter,
+            'active_companies': active,
+            'avg_laid_off_per_company': by_quarter / active.replace(0, np.nan),
+        }).reset_index(),
+        'yearly': by_year.reset_index().sort_values('year'),
+        'industry_totals': fused.groupby('industry', observed=True, sort=False)['total_laid_off'].sum(),
+        'country_totals': fused.groupby('country', observed=True, sort=False)['total_laid_off'].sum(),
+        'size_totals': fused.groupby('company_size_category', observed=True, sort=False)['total_laid_off'].sum(),
+        'total_laid_off': fused['total_laid_off'].sum(),
+        'num_companies': df['company'].nunique(),
+        'num_countries': fused['country'].nunique(),
+    }
+
+@st.cache_data
+def size_trend(years, countries, industries, show_unknown):
+    # Section 5: quarter x company size totals (full grid), plus the smoothed Unknown series
+    df = filter_scope(years, countries, industries)
+    filtered_df = df if show_unknown else df[df['company_size_category'] != 'Unknown']
+
+    # Complete the quarter × size grid by reshaping (unstack -> reindex -> melt), like section 6
+    grouped = (
+        filtered_df.groupby(['quarter', 'company_size_category'], observed=True)['total_laid_off']
+        .sum()
+        .unstack('company_size_category', fill_value=0)
+        .reindex(
+            index=filtered_df['quarter'].unique(),
+            columns=filtered_df['company_size_category'].unique(),
+            fill_value=0
         )
+        .melt(ignore_index=False, value_name='total_laid_off')
+        .reset_index()
+    )
+
+    if show_unknown and 'Unknown' in df['company_size_category'].values:
+        # quarter is an ordered (chronological) category, so the Unknown totals group on it directly
+        unknown_df = df[df['company_size_category'] == 'Unknown']
+        unknown_totals = unknown_df.groupby('quarter', observed=True)['total_laid_off'].sum()
+        # 2-quarter rolling mean (min_periods=1) on the ndarray: first value as is, then pair means
+        vals = unknown_totals.to_numpy(dtype=float)
+        smoothed = vals.copy()
+        smoothed[1:] = (vals[1:] + vals[:-1]) / 2
+        unknown_grouped = pd.DataFrame({
+            'quarter': unknown_totals.index,
+            'company_size_category': 'Unknown (Smoothed)',
+            'total_laid_off': smoothed,
+        })
+        grouped = pd.concat([grouped, unknown_grouped], ignore_index=True)
+
+    # quarter is already an ordered category; keep the quarters in the grid, newest first
+    quarters = grouped['quarter'].cat.remove_unused_categories()
+    grouped['quarter'] = quarters.cat.reorder_categories(quarters.cat.categories[::-1])
+    return grouped
+
+@st.cache_data
+def top_industry_trend(years, countries, industries):
+    # Section 6: quarter x industry totals for the top 6 industries of the scope
+    df = filter_scope(years, countries, industries)
+    all_quarters = df['quarter'].unique()
+    # Only industries with layoffs in scope get a line (checked on the 6 totals, not the grid)
+    top_6 = scope_aggregates(years, countries, industries)['industry_totals'].nlargest(6)
+    top_6_industries = top_6[top_6 > 0].index
+
+    # Complete the quarter × industry grid by reshaping (unstack -> reindex -> melt)
+    return (
+        df[category_mask(df['industry'], top_6_industries)]
+        .groupby(['quarter', 'industry'], observed=True)['total_laid_off']
+        .sum()
+        .unstack('industry', fill_value=0)
+        .reindex(index=all_quarters, columns=top_6_industries, fill_value=0)
+        .melt(ignore_index=False, value_name='total_laid_off')
+        .reset_index()
+    )
+
+@st.cache_data
+def size_pct_box(years, countries, industries):
+    # Section 7 figure, cached per selection (the box trace carries every event in scope).
+    # Only events with a % value are sent; the scope's category order keeps the axis as is.
+    df = filter_scope(years, countries, industries)
+    size_order = df['company_size_category'].unique().tolist()
+    pct = df.loc[df['percentage_laid_off'].notna(), ['company_size_category', 'percentage_laid_off']]
+    fig = px.box(
+        pct, x='company_size_category', y='percentage_laid_off', title="",
+        category_orders={'company_size_category': size_order}
+    )
+    fig.update_layout(
+        xaxis_title="Company Size",
+        yaxis_title="Percentage of Workforce Laid Off",
+        template="plotly_white",
+        xaxis=dict(title_font=dict(color="white")),
+        yaxis=dict(title_font=dict(color="white"))
+    )
+    fig.update_traces(marker=dict(line=dict(color='white', width=2)))
     return fig
 
 @st.cache_data
-def load_data():
-    df = pd.read_csv("data/Cleaned_layoffs.csv")
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df['quarter'] = df['date'].dt.to_period('Q').astype(str)
-    df['year'] = df['date'].dt.year
-    return df
+def quarterly_fig(years, countries, industries, normalize):
+    # Section 1 figure (totals, or average per active company when normalized), cached per
+    # selection like the section 7 box so reruns reuse the built figure
+    aggs = scope_aggregates(years, countries, industries)
+    if not normalize:
+        quarterly = aggs['quarterly']
+        fig = px.line(quarterly, x='quarter', y='total_laid_off', markers=True, title="")
+        fig.update_layout(
+            xaxis_title="Quarter", yaxis_title="Total Laid Off",
+            template="plotly_white",
+            xaxis=dict(title_font=dict(color="white"), side="left"),
+            yaxis=dict(title_font=dict(color="white"))
+        )
+        return add_outlier_annotations(fig, quarterly, top_n=3)
+    quarterly_norm = aggs['quarterly_norm']
+    fig = px.line(
+        quarterly_norm,
+        x='quarter', y='avg_laid_off_per_company',
+        markers=True, title=""
+    )
+    fig.update_layout(
+        xaxis_title="Quarter", yaxis_title="Avg Laid Off per Active Company",
+        template="plotly_white",
+        xaxis=dict(title_font=dict(color="white"), side="left"),
+        yaxis=dict(title_font=dict(color="white"))
+    )
+    # annotate top 3 normalized quarters
+    return add_outlier_annotations(
+        fig, quarterly_norm, top_n=3, value_col='avg_laid_off_per_company', fmt="{:.1f}"
+    )
 
-df_full = load_data()
+@st.cache_data
+def size_trend_fig(years, countries, industries, show_unknown):
+    # Section 5 figure: one line per size category over the cached quarter x size grid
+    grouped = size_trend(years, countries, industries, show_unknown)
+    fig = px.line(grouped, x='quarter', y='total_laid_off', color='company_size_category', markers=True, title="")
+    fig.update_layout(
+        xaxis_title="Quarter",
+        yaxis_title="Total Laid Off",
+        template="plotly_white",
+        xaxis=dict(title_font=dict(color="white"), side="left", autorange="reversed"),
+        yaxis=dict(title_font=dict(color="white"))
+    )
+    return fig
+
+@st.cache_data
+def top_industry_fig(years, countries, industries):
+    # Section 6 figure: one line per top-6 industry over the cached quarter x industry grid
+    industry_time = top_industry_trend(years, countries, industries)
+    fig = px.line(industry_time, x='quarter', y='total_laid_off', color='industry', markers=True, title="")
+    fig.update_layout(
+        xaxis_title="Quarter",
+        yaxis_title="Total Laid Off",
+        template="plotly_white",
+        xaxis=dict(title_font=dict(color="white"), side="left", autorange="reversed"),
+        yaxis=dict(title_font=dict(color="white"))
+    )
+    return fig
 
 #Filters
 with st.sidebar:
@@ -40,68 +248,52 @@ with st.sidebar:
 
     years = st.multiselect(
         "Select Year",
-        options=sorted(df_full['year'].dropna().unique()),
+        options=full_options()['year'],
         default=None
     )
 
     selected_country = st.multiselect(
         "Select Country",
-        options=sorted(df_full['country'].dropna().unique()),
+        options=full_options()['country'],
         default=None
     )
     selected_industry = st.multiselect(
         "Select Industry",
-        options=sorted(df_full['industry'].dropna().unique()),
+        options=full_options()['industry'],
         default=None
     )
 
     normalize_toggle = st.checkbox("Normalize: show average layoffs per active company", value=False)
 
-# Start with full data, apply filters
-df = df_full.copy()
-if years:
-    df = df[df['year'].isin(years)]
-if selected_country:
-    df = df[df['country'].isin(selected_country)]
-if selected_industry:
-    df = df[df['industry'].isin(selected_industry)]
+# Hashable filter keys for the cached aggregations and figures
+scope = (tuple(sorted(years)), tuple(sorted(selected_country)), tuple(sorted(selected_industry)))
+aggs = scope_aggregates(*scope)
 
 #KPI
 # Quarter totals (within filter scope)
-quarterly_all = (
-    df.groupby('quarter')['total_laid_off']
-    .sum()
-    .reset_index()
-    .sort_values('quarter')
-)
+quarterly_all = aggs['quarterly']
 
 # Current year vs last year totals (within scope)
-yearly = (
-    df.groupby('year')['total_laid_off']
-    .sum()
-    .reset_index()
-    .sort_values('year')
-)
+yearly = aggs['yearly']
 
-# compute QoQ
-q_curr = quarterly_all['total_laid_off'].iloc[-1] if len(quarterly_all) else np.nan
-q_prev = quarterly_all['total_laid_off'].iloc[-2] if len(quarterly_all) > 1 else np.nan
+# compute QoQ (both frames are already sorted; read the last two values from the arrays)
+q_vals = quarterly_all['total_laid_off'].to_numpy()
+q_curr = q_vals[-1] if q_vals.size else np.nan
+q_prev = q_vals[-2] if q_vals.size > 1 else np.nan
 q_qoq = pct_change_safe(q_curr, q_prev)
 
 # compute YoY
-if len(yearly) >= 1:
-    y_curr = yearly['total_laid_off'].iloc[-1]
-else:
-    y_curr = np.nan
-y_prev = yearly['total_laid_off'].iloc[-2] if len(yearly) > 1 else np.nan
+y_vals = yearly['total_laid_off'].to_numpy()
+y_curr = y_vals[-1] if y_vals.size else np.nan
+y_prev = y_vals[-2] if y_vals.size > 1 else np.nan
 y_yoy = pct_change_safe(y_curr, y_prev)
 
 # other KPIs
-num_companies = df['company'].nunique()
-num_countries = df['country'].nunique()
+num_companies = aggs['num_companies']
+num_countries = aggs['num_countries']
 
 k1, k2, k3, k4 = st.columns(4)
-k1.metric("Total Layoffs (scope)", f"{int(df['total_laid_off'].sum()):,}")
+k1.metric("Total Layoffs (scope)", f"{int(aggs['total_laid_off']):,}")
 k2.metric("QoQ change", f"{q_qoq:+.1f}%" if not pd.isna(q_qoq) else "–")
 k3.metric("YoY change", f"{y_yoy:+.1f}%" if not pd.isna(y_yoy) else "–")
 k4.metric("Companies / Countries", f"{num_companies:,} / {num_countries:,}")
@@ -109,71 +301,18 @@ k4.metric("Companies / Countries", f"{num_companies:,} / {num_countries:,}")
 st.markdown("---")
 
 #1> Total Layoffs Over Time (Quarterly)
-quarterly = df.groupby('quarter')['total_laid_off'].sum().reset_index()
-quarterly = quarterly.sort_values('quarter')
-
-# Normalized: average per active company per quarter
-active_counts = (
-    df.groupby(['quarter'])['company']
-    .nunique()
-    .reset_index(name='active_companies')
-    .sort_values('quarter')
-)
-quarterly_norm = quarterly.merge(active_counts, on='quarter', how='left')
-quarterly_norm['avg_laid_off_per_company'] = (
-    quarterly_norm['total_laid_off'] / quarterly_norm['active_companies'].replace(0, np.nan)
-)
-
 st.subheader("1. Total Layoffs Over Time (Quarterly)")
 st.caption(
     "Quarter-by-quarter totals in the current filter scope. "
     "If **Normalize** is enabled, we plot the average per active company: "
     "`avg_laid_off_per_company = total_laid_off / #active_companies_in_quarter`."
 )
-if not normalize_toggle:
-    fig_1 = px.line(quarterly, x='quarter', y='total_laid_off', markers=True, title="")
-    fig_1.update_layout(
-        xaxis_title="Quarter", yaxis_title="Total Laid Off",
-        template="plotly_white",
-        xaxis=dict(title_font=dict(color="white"), side="left"),
-        yaxis=dict(title_font=dict(color="white"))
-    )
-    fig_1 = add_outlier_annotations(fig_1, quarterly, top_n=3)
-else:
-    fig_1 = px.line(
-        quarterly_norm,
-        x='quarter', y='avg_laid_off_per_company',
-        markers=True, title=""
-    )
-    fig_1.update_layout(
-        xaxis_title="Quarter", yaxis_title="Avg Laid Off per Active Company",
-        template="plotly_white",
-        xaxis=dict(title_font=dict(color="white"), side="left"),
-        yaxis=dict(title_font=dict(color="white"))
-    )
-    # annotate top 3 normalized quarters
-    topn = quarterly_norm.nlargest(3, 'avg_laid_off_per_company')
-    for _, r in topn.iterrows():
-        fig_1.add_scatter(
-            x=[r["quarter"]], y=[r["avg_laid_off_per_company"]],
-            mode="markers+text",
-            text=[f"⬆ {r['avg_laid_off_per_company']:.1f}"],
-            textposition="top center",
-            marker=dict(size=10, color="#EF553B", line=dict(color="black", width=1)),
-            showlegend=False
-        )
+fig_1 = quarterly_fig(*scope, normalize_toggle)
 st.plotly_chart(fig_1, use_container_width=True)
 st.markdown("---")
 
 #2> Quarterly Layoffs by Country (Top 10)
-df_valid = df[df['industry'].notna()]
-top_industries = (
-    df_valid.groupby('industry')['total_laid_off']
-    .sum()
-    .sort_values(ascending=False)
-    .head(10)
-    .reset_index()
-)
+top_industries = aggs['industry_totals'].nlargest(10).reset_index()
 st.subheader("2. Top 10 Industries by Total Layoffs")
 st.caption(
     "Industries with the highest total layoffs in the current scope. "
@@ -191,13 +330,7 @@ st.plotly_chart(fig_2, use_container_width=True)
 st.markdown("---")
 
 #3> Top 10 Countries by Total Layoffs
-top_countries = (
-    df.groupby('country')['total_laid_off']
-    .sum()
-    .sort_values(ascending=False)
-    .head(10)
-    .reset_index()
-)
+top_countries = aggs['country_totals'].nlargest(10).reset_index()
 st.subheader("3. Top 10 Countries by Total Layoffs")
 st.caption(
     "Countries with the highest total layoffs in the current scope. "
@@ -215,117 +348,45 @@ st.plotly_chart(fig_3, use_container_width=True)
 st.markdown("---")
 
 #4> Total Layoffs by Company Size
-if 'company_size_category' in df.columns:
-    size_order = ['Small (<500)', 'Mid (500–4999)', 'Large (5000+)', 'Unknown']
-    size_totals = (
-        df.groupby('company_size_category')['total_laid_off']
-        .sum()
-        .reindex(size_order)
-        .reset_index()
-    )
-    st.subheader("4. Total Layoffs by Company Size")
-    st.caption(
-        "Total layoffs aggregated by company size category in the current scope. "
-        "Computed as `sum(total_laid_off)` per `company_size_category`."
-    )
-    fig_4 = px.bar(size_totals, x='company_size_category', y='total_laid_off', title="")
-    fig_4.update_layout(
-        xaxis_title="Company Size",
-        yaxis_title="Total Laid Off",
-        template="plotly_white",
-        xaxis=dict(title_font=dict(color="white"), side="left"),
-        yaxis=dict(title_font=dict(color="white"))
-    )
-    st.plotly_chart(fig_4, use_container_width=True)
+size_order = ['Small (<500)', 'Mid (500–4999)', 'Large (5000+)', 'Unknown']
+size_totals = aggs['size_totals'].reindex(size_order).reset_index()
+st.subheader("4. Total Layoffs by Company Size")
+st.caption(
+    "Total layoffs aggregated by company size category in the current scope. "
+    "Computed as `sum(total_laid_off)` per `company_size_category`."
+)
+fig_4 = px.bar(size_totals, x='company_size_category', y='total_laid_off', title="")
+fig_4.update_layout(
+    xaxis_title="Company Size",
+    yaxis_title="Total Laid Off",
+    template="plotly_white",
+    xaxis=dict(title_font=dict(color="white"), side="left"),
+    yaxis=dict(title_font=dict(color="white"))
+)
+st.plotly_chart(fig_4, use_container_width=True)
 st.markdown("---")
 
 #5> Quarterly Layoffs by Company Size
-if 'company_size_category' in df.columns:
-    show_unknown = st.sidebar.checkbox("Include 'Unknown' in Company Size Trends", value=False)
+show_unknown = st.sidebar.checkbox("Include 'Unknown' in Company Size Trends", value=False)
 
-    filtered_df = df.copy()
-    if not show_unknown:
-        filtered_df = filtered_df[filtered_df['company_size_category'] != 'Unknown']
+fig_5 = size_trend_fig(*scope, show_unknown)
 
-    all_quarters = pd.Series(filtered_df['quarter'].unique(), name='quarter')
-    all_sizes = pd.Series(filtered_df['company_size_category'].unique(), name='company_size_category')
-    full_index = pd.MultiIndex.from_product([all_quarters, all_sizes], names=['quarter', 'company_size_category'])
-
-    grouped = (
-        filtered_df.groupby(['quarter', 'company_size_category'])['total_laid_off']
-        .sum()
-        .reindex(full_index, fill_value=0)
-        .reset_index()
-    )
-
-    if show_unknown and 'Unknown' in df['company_size_category'].values:
-        unknown_df = df[df['company_size_category'] == 'Unknown'].copy()
-        unknown_df['quarter_dt'] = pd.PeriodIndex(unknown_df['quarter'], freq='Q').to_timestamp()
-        unknown_grouped = unknown_df.groupby('quarter_dt')['total_laid_off'].sum().rolling(2, min_periods=1).mean()
-        unknown_grouped = unknown_grouped.reset_index()
-        unknown_grouped['quarter'] = unknown_grouped['quarter_dt'].dt.to_period('Q').astype(str)
-        unknown_grouped['company_size_category'] = 'Unknown (Smoothed)'
-        unknown_grouped = unknown_grouped[['quarter', 'company_size_category', 'total_laid_off']]
-        grouped = pd.concat([grouped, unknown_grouped], ignore_index=True)
-
-    grouped['quarter'] = pd.Categorical(
-        grouped['quarter'],
-        categories=sorted(grouped['quarter'].unique(), reverse=True),
-        ordered=True
-    )
-
-    st.subheader("5. Quarterly Layoffs by Company Size")
-    st.caption(
-        "Trend of layoffs per quarter split by company size. "
-        "We build a full `quarter × size` grid so lines don’t break, and optionally smooth the **Unknown** series."
-    )
-    fig_5 = px.line(grouped, x='quarter', y='total_laid_off', color='company_size_category', markers=True, title="")
-    fig_5.update_layout(
-        xaxis_title="Quarter",
-        yaxis_title="Total Laid Off",
-        template="plotly_white",
-        xaxis=dict(title_font=dict(color="white"), side="left", autorange="reversed"),
-        yaxis=dict(title_font=dict(color="white"))
-    )
-    st.plotly_chart(fig_5, use_container_width=True)
+st.subheader("5. Quarterly Layoffs by Company Size")
+st.caption(
+    "Trend of layoffs per quarter split by company size. "
+    "We build a full `quarter × size` grid so lines don’t break, and optionally smooth the **Unknown** series."
+)
+st.plotly_chart(fig_5, use_container_width=True)
 st.markdown("---")
 
 #6> Quarterly Layoffs by Top 6 Industries
-all_quarters = df['quarter'].unique()
-top_6_industries = (
-    df.groupby('industry')['total_laid_off']
-    .sum()
-    .sort_values(ascending=False)
-    .head(6)
-    .index
-)
-
-full_index = pd.MultiIndex.from_product([all_quarters, top_6_industries], names=['quarter', 'industry'])
-
-industry_time = (
-    df[df['industry'].isin(top_6_industries)]
-    .groupby(['quarter', 'industry'])['total_laid_off']
-    .sum()
-    .reindex(full_index, fill_value=0)
-    .reset_index()
-)
-
-non_zero_industries = industry_time.groupby('industry')['total_laid_off'].sum()
-industry_time = industry_time[industry_time['industry'].isin(non_zero_industries[non_zero_industries > 0].index)]
+fig_6 = top_industry_fig(*scope)
 
 st.subheader("6. Quarterly Layoffs by Top 6 Industries")
 st.caption(
     "Quarterly trend lines for the **top 6 industries** by total layoffs in the current scope. "
     "We complete the `quarter × industry` grid and fill missing with 0 to keep lines continuous."
 )
-fig_6 = px.line(industry_time, x='quarter', y='total_laid_off', color='industry', markers=True, title="")
-fig_6.update_layout(
-    xaxis_title="Quarter",
-    yaxis_title="Total Laid Off",
-    template="plotly_white",
-    xaxis=dict(title_font=dict(color="white"), side="left", autorange="reversed"),
-    yaxis=dict(title_font=dict(color="white"))
-)
 st.plotly_chart(fig_6, use_container_width=True)
 st.markdown("---")
 
@@ -335,14 +396,6 @@ st.caption(
     "Distribution of the **% of workforce laid off** per event, grouped by company size category. "
     "Each point is an event; the box shows median and IQR. Uses `percentage_laid_off` from the dataset."
 )
-fig_7 = px.box(df, x='company_size_category', y='percentage_laid_off', title="")
-fig_7.update_layout(
-    xaxis_title="Company Size",
-    yaxis_title="Percentage of Workforce Laid Off",
-    template="plotly_white",
-    xaxis=dict(title_font=dict(color="white")),
-    yaxis=dict(title_font=dict(color="white"))
-)
-fig_7.update_traces(marker=dict(line=dict(color='white', width=2)))
+fig_7 = size_pct_box(*scope)
 st.plotly_chart(fig_7, use_container_width=True)
 st.markdown("---")
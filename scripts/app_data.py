@@ -0,0 +1,81 @@
+import pandas as pd
+import numpy as np
+import streamlit as st
+
+# Columns the Streamlit pages read from the cleaned data
+APP_COLUMNS = [
+    'date', 'quarter', 'year', 'company', 'industry', 'country', 'location', 'stage',
+    'total_laid_off', 'percentage_laid_off', 'funds_raised_clean', 'company_size_category'
+]
+
+
+def sorted_options(s):
+    # Sorted distinct non-null values of a column, for sidebar option lists. Categorical
+    # columns (sorted categories) only need np.unique over their integer codes.
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = np.unique(s.cat.codes.to_numpy())
+        return s.cat.categories[codes[codes >= 0]].tolist()
+    values = s.to_numpy()
+    return np.unique(values[~pd.isna(values)]).tolist()
+
+
+def category_mask(s, values):
+    # Boolean mask of rows whose category is in values, as one lookup over the integer codes
+    # (missing values have code -1 and never match)
+    wanted = np.zeros(len(s.cat.categories) + 1, dtype=bool)
+    positions = s.cat.categories.get_indexer(list(values))
+    wanted[positions[positions >= 0]] = True
+    return wanted[s.cat.codes.to_numpy()]
+
+
+@st.cache_resource
+def get_df():
+    # One shared, read-only frame for every page and session.
+    # Pages must filter into new frames and never modify this one in place.
+    # memory-mapped read: pyarrow decodes straight from the mapped file, no read buffer copy
+    df = pd.read_parquet('data/Cleaned_layoffs.parquet', columns=APP_COLUMNS, memory_map=True)
+    # company / quarter as Categorical like the other text columns; 'YYYYQn' labels
+    # sort chronologically, so quarter is an ordered category
+    df['company'] = df['company'].astype('category')
+    df['quarter'] = pd.Categorical(
+        df['quarter'], categories=sorted(df['quarter'].dropna().unique()), ordered=True
+    )
+    # Narrower numeric dtypes halve the bytes every aggregation scans: headcounts are whole
+    # numbers far below 2**24 (exact in float32, NaN kept). year becomes int16 when every
+    # date parsed; a year column with NaNs (unparseable dates) stays float.
+    # percentage / funds stay float64, their fractional values feed the ratio metrics.
+    df['total_laid_off'] = df['total_laid_off'].astype(np.float32)
+    df['year'] = pd.to_numeric(df['year'], downcast='integer')
+    return df
+
+
+@st.cache_resource
+def full_options():
+    # Sidebar option lists over the whole shared frame; they never change, so build them once
+    df = get_df()
+    return {col: sorted_options(df[col]) for col in ['year', 'country', 'industry']}
+
+
+@st.cache_resource
+def year_row_index():
+    # year -> row positions in the shared frame, built once so a year filter is a dict lookup
+    return get_df().groupby('year', sort=False).indices
+
+
+def year_positions(years):
+    # Row positions of the selected years in the shared frame (all rows when none), in file order
+    if not years:
+        return np.arange(len(get_df()))
+    index = year_row_index()
+    parts = [index[y] for y in years if y in index]
+    if not parts:
+        return np.empty(0, dtype=np.intp)
+    return np.sort(np.concatenate(parts))
+
+
+def rows_for_years(years):
+    # Shared frame restricted to the selected years (all rows when none), in file order
+    df = get_df()
+    if not years:
+        return df
+    return df.take(year_positions(years))
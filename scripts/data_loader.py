@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 def clean_layoff_data(df):
     #---Data Cleaning---#
@@ -8,63 +9,78 @@ def clean_layoff_data(df):
     df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
 
     # Clean and convert 'percentage_laid_off' from string with '%' to float
-    df['percentage_laid_off'] = (
-    df['percentage_laid_off']
-    .astype(str)
-    .str.replace('%', '')
-    .replace({'nan': None, 'None': None, '': None})
-    .astype(float)
-    )
+    df['percentage_laid_off'] = pd.to_numeric(
+    df['percentage_laid_off'].astype('string').str.rstrip('%'),
+    errors='coerce'
+    ).astype(float)
 
-    # Function to Convert Funds into Numerical values
-    def parse_funding(value):
-        if pd.isna(value):
-            return None
-        value = str(value).replace('$', '').replace(',', '').upper()
-        if 'M' in value:
-            return float(value.replace('M', '')) * 1_000_000
-        elif 'B' in value:
-            return float(value.replace('B', '')) * 1_000_000_000
-        else:
-            try:
-                return float(value)
-            except:
-                return None
-
-    # Apply function to clean Funds-Raised
-    df['funds_raised_clean'] = df['funds_raised'].apply(parse_funding)
+    # Convert Funds into Numerical values ('M' / 'B' suffix scales the amount)
+    funds = (
+    df['funds_raised']
+    .astype('string')
+    .str.replace('$', '', regex=False)
+    .str.replace(',', '', regex=False)
+    .str.upper()
+    )
+    is_m = funds.str.contains('M', regex=False).fillna(False).to_numpy(dtype=bool)
+    is_b = funds.str.contains('B', regex=False).fillna(False).to_numpy(dtype=bool)
+    funds_num = pd.to_numeric(
+        funds.str.replace('M', '', regex=False).str.replace('B', '', regex=False),
+        errors='coerce'
+    )
+    df['funds_raised_clean'] = np.where(
+        is_m, funds_num * 1_000_000,
+        np.where(is_b, funds_num * 1_000_000_000, funds_num)
+    )
 
     # Date extraction
     df['year'] = df['date'].dt.year
     df['month'] = df['date'].dt.month
-    df['quarter'] = df['date'].dt.to_period('Q')
+    # missing dates stay missing (astype(str) alone would store the label 'NaT')
+    df['quarter'] = df['date'].dt.to_period('Q').astype(str).where(df['date'].notna())
 
     # Company Size based on Layoffs
-    def estimate_size(row):
-        try:
-            if pd.notna(row['total_laid_off']) and pd.notna(row['percentage_laid_off']) and row['percentage_laid_off'] > 0:
-                return int(row['total_laid_off'] / (row['percentage_laid_off'] / 100))
-        except:
-            return None
-        return None
-
-    df['estimated_company_size'] = df.apply(estimate_size, axis=1)
+    pct = df['percentage_laid_off']
+    total = df['total_laid_off']
+    has_size = (pct.notna() & total.notna() & (pct > 0)).to_numpy()
+    df['estimated_company_size'] = np.where(
+        has_size,
+        np.floor(total / (pct.where(has_size) / 100)),
+        np.nan
+    )
 
     # Categorize Company into Small, Mid, Large 
-    def categorize_size(size):
-        if pd.isna(size):
-            return 'Unknown'
-        elif size < 500:
-            return 'Small (<500)'
-        elif size < 5000:
-            return 'Mid (500–4999)'
-        else:
-            return 'Large (5000+)'
-
-    df['company_size_category'] = df['estimated_company_size'].apply(categorize_size)
+    size_category = pd.cut(
+        df['estimated_company_size'],
+        bins=[-np.inf, 500, 5000, np.inf],
+        labels=['Small (<500)', 'Mid (500–4999)', 'Large (5000+)'],
+        right=False
+    )
+    df['company_size_category'] = size_category.cat.add_categories(['Unknown']).fillna('Unknown')
 
     # Handle missing locations
     df['country'] = df['country'].fillna('Unknown')
     df['location'] = df['location'].fillna('Unknown')
 
+    # Low-cardinality text columns as Categorical (integer codes instead of repeated strings)
+    for col in ['industry', 'country', 'stage', 'location', 'company_size_category']:
+        df[col] = df[col].astype('category')
+
     return df
+
+
+def save_cleaned_data(df, path='data/Cleaned_layoffs.parquet'):
+    # Parquet keeps datetime / categorical dtypes, so the app can load it without re-parsing
+    df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+    return path
+
+
+def company_year_totals(df):
+    # (year, industry, company) -> total laid off; small lookup table for the industry share views
+    return df.groupby(['year', 'industry', 'company'], as_index=False, observed=True)['total_laid_off'].sum()
+
+
+if __name__ == '__main__':
+    cleaned = clean_layoff_data(pd.read_csv('data/layoffs.csv'))
+    save_cleaned_data(cleaned)
+    save_cleaned_data(company_year_totals(cleaned), 'data/agg_company_year.parquet')
@@ -2,55 +2,75 @@ import pandas as pd
 import numpy as np
 
 def calculate_layoff_efficiency(df):
-    df_eff = df[
+    # Filter and derive on plain arrays, then reduce every column per company with
+    # np.bincount over one set of (sorted) company codes
+    valid = (
         df['total_laid_off'].notna() &
         df['percentage_laid_off'].notna() &
         df['funds_raised_clean'].notna() &
+        df['company'].notna() &
         (df['percentage_laid_off'] > 0) &
         (df['funds_raised_clean'] > 0)
-    ].copy()
+    ).to_numpy()
+    total = df['total_laid_off'].to_numpy(dtype=float)[valid]
+    pct = df['percentage_laid_off'].to_numpy(dtype=float)[valid]
+    funds = df['funds_raised_clean'].to_numpy(dtype=float)[valid]
+    layoffs_per_million = total / (funds / 1_000_000)
+    efficiency_score = layoffs_per_million / pct
 
-    df_eff['layoffs_per_million'] = df_eff['total_laid_off'] / (df_eff['funds_raised_clean'] / 1_000_000)
-    df_eff['layoff_efficiency_score'] = df_eff['layoffs_per_million'] / df_eff['percentage_laid_off']
+    company_codes, companies = pd.factorize(df['company'][valid], sort=True)
+    n_companies = len(companies)
+    counts = np.bincount(company_codes, minlength=n_companies)
 
     inefficient = (
-        df_eff.groupby('company')
-        .agg({
-            'total_laid_off': 'sum',
-            'percentage_laid_off': 'mean',
-            'funds_raised_clean': 'sum',
-            'layoffs_per_million': 'mean',
-            'layoff_efficiency_score': 'mean'
+        pd.DataFrame({
+            'company': companies,
+            'total_laid_off': np.bincount(company_codes, weights=total, minlength=n_companies),
+            'percentage_laid_off': np.bincount(company_codes, weights=pct, minlength=n_companies) / counts,
+            'funds_raised_clean': np.bincount(company_codes, weights=funds, minlength=n_companies),
+            'layoffs_per_million': np.bincount(company_codes, weights=layoffs_per_million, minlength=n_companies) / counts,
+            'layoff_efficiency_score': np.bincount(company_codes, weights=efficiency_score, minlength=n_companies) / counts,
         })
         .sort_values(by='layoff_efficiency_score', ascending=False)
-        .reset_index()
+        .reset_index(drop=True)
     )
     return inefficient
 
 
 def calculate_layoff_instability(df):
-    df['quarter'] = pd.to_datetime(df['date'], errors='coerce').dt.to_period('Q')
+    # Distinct (company, quarter) pairs counted on integer codes: one np.unique over the
+    # combined pair codes; the caller's frame is untouched
+    company_codes, companies = pd.factorize(df['company'], sort=True)
+    # Use the precomputed quarter column when the frame has one; derive it from date otherwise
+    if 'quarter' in df.columns:
+        quarter = df['quarter']
+    else:
+        quarter = pd.to_datetime(df['date'], errors='coerce').dt.to_period('Q')
+    quarter_codes, quarters = pd.factorize(quarter)
+    valid = (company_codes >= 0) & (quarter_codes >= 0)
+    pairs = np.unique(company_codes[valid].astype(np.int64) * len(quarters) + quarter_codes[valid])
+    company_idx, counts = np.unique(pairs // max(len(quarters), 1), return_counts=True)
+
     instability = (
-        df.dropna(subset=['company', 'quarter'])[['company', 'quarter']]
-        .drop_duplicates()
-        .groupby('company')
-        .size()
-        .reset_index(name='layoff_instability_score')
+        pd.DataFrame({'company': companies[company_idx], 'layoff_instability_score': counts})
         .sort_values('layoff_instability_score', ascending=False)
     )
     return instability
 
 
 def calculate_layoff_severity(df):
-    df_filtered = df[
-        df['percentage_laid_off'].notnull() &
-        df['total_laid_off'].notnull()
-    ].copy()
+    df_filtered = df.loc[
+        df['percentage_laid_off'].notnull() & df['total_laid_off'].notnull(),
+        ['company', 'percentage_laid_off', 'total_laid_off']
+    ]
 
-    df_filtered['layoff_severity_index'] = df_filtered['percentage_laid_off'] * np.log(df_filtered['total_laid_off'] + 1)
+    # percentage × ln(total + 1), written into the log1p result array (no extra temporaries)
+    lsi = np.log1p(df_filtered['total_laid_off'].to_numpy(dtype=float))
+    np.multiply(lsi, df_filtered['percentage_laid_off'].to_numpy(dtype=float), out=lsi)
+    layoff_severity_index = pd.Series(lsi, index=df_filtered.index, name='layoff_severity_index')
 
     lsi_by_company = (
-        df_filtered.groupby('company')['layoff_severity_index']
+        layoff_severity_index.groupby(df_filtered['company'], observed=True)
         .mean()
         .reset_index()
         .sort_values('layoff_severity_index', ascending=False)
@@ -59,19 +79,25 @@ def calculate_layoff_severity(df):
 
 
 def calculate_fragility_index(df):
-    fragility_df = (
-        df[['location', 'company', 'percentage_laid_off']]
-        .dropna()
-        .groupby(['location', 'company'])
-        .mean()  # avg % per company per location
-        .reset_index()
-        .groupby('location')
-        .agg(
-            num_companies=('company', 'nunique'),
-            avg_pct=('percentage_laid_off', 'mean')
-        )
+    # avg % per company per location, then per location the company count and the mean of
+    # those averages, both reduced with np.bincount over integer codes
+    rows = df[['location', 'company', 'percentage_laid_off']].dropna()
+    location_codes, locations = pd.factorize(rows['location'], sort=True)
+    company_codes, companies = pd.factorize(rows['company'])
+    pct = rows['percentage_laid_off'].to_numpy(dtype=float)
+
+    pairs, pair_idx = np.unique(
+        location_codes.astype(np.int64) * len(companies) + company_codes, return_inverse=True
     )
+    pair_avg = np.bincount(pair_idx, weights=pct) / np.bincount(pair_idx)
+    pair_location = pairs // max(len(companies), 1)
+    num_companies = np.bincount(pair_location, minlength=len(locations))
 
+    fragility_df = pd.DataFrame({
+        'location': locations,
+        'num_companies': num_companies,
+        'avg_pct': np.bincount(pair_location, weights=pair_avg, minlength=len(locations)) / num_companies,
+    })
     fragility_df['fragility_index'] = fragility_df['num_companies'] * fragility_df['avg_pct']
-    fragility_df = fragility_df.sort_values('fragility_index', ascending=False).reset_index()
+    fragility_df = fragility_df.sort_values('fragility_index', ascending=False).reset_index(drop=True)
     return fragility_df